@@ -19,6 +19,10 @@ export interface SimulationConfig {
     minimum_pressure: number;
     pressure_exponent: number;
   };
+  // 'base64' ships per-metric float32 matrices in `series` instead of per-node lists
+  series_format?: 'lists' | 'base64';
+  // Omit node_results/link_results and return only aggregate stats
+  stats_only?: boolean;
 }
 
 export interface WaterQualityConfig {
@@ -36,6 +40,8 @@ export interface ScenarioConfig {
   type: 'pipe_breaks' | 'pump_failures' | 'power_outage' | 'tank_damage';
   severity: number; // 0-1
   affected_components?: string[];
+  series_format?: 'lists' | 'base64';
+  stats_only?: boolean;
 }
 
 export interface SimulationResults {
@@ -63,10 +69,45 @@ export interface SimulationResults {
       unit: string;
     };
   };
+  data?: {
+    // Present when the run was requested with series_format: 'base64' (see decodeSeriesBlock)
+    series?: Record<string, EncodedSeriesBlock>;
+    [key: string]: unknown;
+  };
   timestamp?: string;
   error?: string;
 }
 
+/** One metric from `data.series`: row-major (timesteps x columns) little-endian float32 values */
+export interface EncodedSeriesBlock {
+  columns: string[];
+  shape: [number, number];
+  dtype: 'float32';
+  data_b64: string;
+}
+
+/**
+ * Decode a base64 series block into one Float32Array time series per column
+ * (node or link id), matching the per-element lists of the default format.
+ */
+export function decodeSeriesBlock(block: EncodedSeriesBlock): Record<string, Float32Array> {
+  const [rows, cols] = block.shape;
+  const bytes = Buffer.from(block.data_b64, 'base64');
+  // Copy into an aligned buffer: Buffer.from may return a view into a shared, unaligned pool
+  const matrix = new Float32Array(rows * cols);
+  new Uint8Array(matrix.buffer).set(bytes.subarray(0, matrix.byteLength));
+
+  const byColumn: Record<string, Float32Array> = {};
+  block.columns.forEach((column, j) => {
+    const series = new Float32Array(rows);
+    for (let i = 0; i < rows; i++) {
+      series[i] = matrix[i * cols + j];
+    }
+    byColumn[column] = series;
+  });
+  return byColumn;
+}
+
 export class WNTRSimulationService {
   private pythonPath: string;
   private servicePath: string;
@@ -226,11 +267,13 @@ export class WNTRSimulationService {
         env: { ...process.env }
       });
 
-      let stdout = '';
+      // Keep stdout as raw chunks and decode once: results can be several MB,
+      // and per-chunk decoding can split multi-byte characters.
+      const stdoutChunks: Buffer[] = [];
       let stderr = '';
 
-      pythonProcess.stdout.on('data', (data) => {
-        stdout += data.toString();
+      pythonProcess.stdout.on('data', (data: Buffer) => {
+        stdoutChunks.push(data);
       });
 
       pythonProcess.stderr.on('data', (data) => {
@@ -238,6 +281,7 @@ export class WNTRSimulationService {
       });
 
       pythonProcess.on('close', (code) => {
+        const stdout = Buffer.concat(stdoutChunks).toString('utf8');
         if (code === 0) {
           try {
             const result = JSON.parse(stdout);
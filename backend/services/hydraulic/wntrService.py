@@ -3,6 +3,8 @@ WNTR Service for EPANET file handling and network analysis
 """
 import json
 import os
+import hashlib
+import pickle
 import tempfile
 from typing import Dict, Any, List, Optional, Tuple
 import warnings
@@ -10,6 +12,11 @@ import wntr
 import wntr.metrics.topographic
 import numpy as np
 
+try:
+    import orjson  # Optional C-accelerated encoder; falls back to json when not installed
+except ImportError:
+    orjson = None
+
 # Suppress specific WNTR warnings that are informational only
 warnings.filterwarnings('ignore', message='Changing the headloss formula from')
 warnings.filterwarnings('ignore', message='Not all curves were used in')
@@ -37,30 +44,39 @@ class WNTRService:
             # Reset temp file path
             self.temp_file_path = None
             
-            # First, try to fix common issues in the INP file
-            self._preprocess_inp_file(file_path)
-            
-            # Load the EPANET model (use temp file if created, otherwise original)
-            load_path = self.temp_file_path if self.temp_file_path else file_path
-            # Load the file
-            
-            # Capture warnings during model loading
-            model_warnings = []
-            with warnings.catch_warnings(record=True) as w:
-                warnings.simplefilter("always")
-                wn = wntr.network.WaterNetworkModel(load_path)
-                # Collect relevant warnings
-                for warning in w:
-                    if 'headloss formula' in str(warning.message):
-                        model_warnings.append({
-                            'type': 'headloss_change',
-                            'message': 'Headloss formula was changed. Roughness coefficient units may need adjustment.'
-                        })
-                    elif 'curves were used' in str(warning.message):
-                        model_warnings.append({
-                            'type': 'unused_curves',
-                            'message': 'Some curves in the file were not assigned to any pump or efficiency.'
-                        })
+            # Reuse the parsed model from a previous load if the file content is unchanged
+            with open(file_path, 'rb') as f:
+                content_digest = hashlib.sha256(f.read()).hexdigest()
+            cache_path = self._model_cache_path(file_path)
+            cached = self._read_cached_model(cache_path, content_digest)
+            if cached is not None:
+                wn, model_warnings = cached
+            else:
+                # First, try to fix common issues in the INP file
+                self._preprocess_inp_file(file_path)
+                
+                # Load the EPANET model (use temp file if created, otherwise original)
+                load_path = self.temp_file_path if self.temp_file_path else file_path
+                
+                # Capture warnings during model loading
+                model_warnings = []
+                with warnings.catch_warnings(record=True) as w:
+                    warnings.simplefilter("always")
+                    wn = wntr.network.WaterNetworkModel(load_path)
+                    # Collect relevant warnings
+                    for warning in w:
+                        if 'headloss formula' in str(warning.message):
+                            model_warnings.append({
+                                'type': 'headloss_change',
+                                'message': 'Headloss formula was changed. Roughness coefficient units may need adjustment.'
+                            })
+                        elif 'curves were used' in str(warning.message):
+                            model_warnings.append({
+                                'type': 'unused_curves',
+                                'message': 'Some curves in the file were not assigned to any pump or efficiency.'
+                            })
+                
+                self._write_cached_model(cache_path, content_digest, wn, model_warnings)
                         
             self.current_model = wn
             self.model_path = file_path  # Keep original path for reference
@@ -71,14 +87,14 @@ class WNTRService:
             network_info = {
                 'name': os.path.basename(file_path),
                 'summary': {
-                    'junctions': len(wn.junction_name_list),
-                    'tanks': len(wn.tank_name_list),
-                    'reservoirs': len(wn.reservoir_name_list),
-                    'pipes': len(wn.pipe_name_list),
-                    'pumps': len(wn.pump_name_list),
-                    'valves': len(wn.valve_name_list),
-                    'patterns': len(wn.pattern_name_list),
-                    'curves': len(wn.curve_name_list)
+                    'junctions': wn.num_junctions,
+                    'tanks': wn.num_tanks,
+                    'reservoirs': wn.num_reservoirs,
+                    'pipes': wn.num_pipes,
+                    'pumps': wn.num_pumps,
+                    'valves': wn.num_valves,
+                    'patterns': wn.num_patterns,
+                    'curves': wn.num_curves
                 }
             }
             
@@ -170,9 +186,8 @@ class WNTRService:
         """Extract node data for visualization"""
         nodes = []
         
-        # Process all nodes
-        for node_name in wn.node_name_list:
-            node = wn.get_node(node_name)
+        # Process all nodes (iterate the registry directly instead of a get_node lookup per name)
+        for node_name, node in wn.nodes():
             
             # Basic node data
             node_data = {
@@ -243,9 +258,8 @@ class WNTRService:
         """Extract link data for visualization"""
         links = []
         
-        # Process all links
-        for link_name in wn.link_name_list:
-            link = wn.get_link(link_name)
+        # Process all links (iterate the registry directly instead of a get_link lookup per name)
+        for link_name, link in wn.links():
             
             # Basic link data
             link_data = {
@@ -721,6 +735,33 @@ class WNTRService:
                 'error': str(e)
             }
     
+    def load_and_simulate(self, file_path: str, simulation_type: str = 'single') -> Dict[str, Any]:
+        """
+        Load an INP file and run a simulation on it in one call
+        
+        Args:
+            file_path: Path to the INP file
+            simulation_type: Type of simulation ('single' or 'extended')
+            
+        Returns:
+            Dictionary with the load result and, if loading succeeded, the simulation result
+        """
+        load_result = self.load_inp_file(file_path)
+        if not load_result['success']:
+            return {
+                'success': False,
+                'error': load_result['error'],
+                'load': load_result,
+                'simulation': None
+            }
+        
+        simulation_result = self.run_simulation(simulation_type)
+        return {
+            'success': simulation_result['success'],
+            'load': load_result,
+            'simulation': simulation_result
+        }
+    
     def _extract_node_results(self, results, time) -> Dict[str, Dict[str, float]]:
         """Extract node results for a specific time"""
         node_results = {}
@@ -802,22 +843,24 @@ class WNTRService:
         sim = wntr.sim.WNTRSimulator(wn)
         results = sim.run_sim()
         
-        # Calculate statistics
-        pressure = results.node['pressure']
+        # Calculate statistics on the raw arrays: one reduction each over the flat buffer
+        # instead of a per-column Series followed by a second reduction
         flow = results.link['flowrate']
+        p = results.node['pressure'].to_numpy(dtype=np.float64)
+        flow_values = flow.to_numpy(dtype=np.float64)
         
         return {
             'pressure_stats': {
-                'min': float(pressure.min().min()),
-                'max': float(pressure.max().max()),
-                'mean': float(pressure.mean().mean()),
+                'min': float(np.nanmin(p)),
+                'max': float(np.nanmax(p)),
+                'mean': float(np.nanmean(p)),
                 'nodes_below_minimum': [],  # TODO: Implement based on minimum pressure requirement
             },
             'flow_stats': {
-                'min': float(flow.min().min()),
-                'max': float(flow.max().max()),
-                'mean': float(flow.mean().mean()),
-                'zero_flow_links': flow.columns[(flow == 0).any()].tolist()
+                'min': float(np.nanmin(flow_values)),
+                'max': float(np.nanmax(flow_values)),
+                'mean': float(np.nanmean(flow_values)),
+                'zero_flow_links': flow.columns[(flow_values == 0).any(axis=0)].tolist()
             }
         }
     
@@ -840,7 +883,7 @@ class WNTRService:
         return {
             'total_base_demand': total_base_demand,
             'demand_by_pattern': demand_by_pattern,
-            'number_of_demand_nodes': len([j for j in wn.junction_name_list if wn.get_node(j).demand_timeseries_list])
+            'number_of_demand_nodes': sum(1 for _, junction in wn.junctions() if junction.demand_timeseries_list)
         }
     
     def _energy_analysis(self, wn) -> Dict[str, Any]:
@@ -892,8 +935,13 @@ class WNTRService:
                 'curves': self._get_curves_data(self.current_model)
             }
             
-            with open(output_path, 'w') as f:
-                json.dump(network_data, f, indent=2)
+            # Binary write of orjson's bytes when available; the export stays indented for readability
+            if orjson is not None:
+                with open(output_path, 'wb') as f:
+                    f.write(orjson.dumps(network_data, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
+            else:
+                with open(output_path, 'w') as f:
+                    json.dump(network_data, f, indent=2)
             
             return {
                 'success': True,
@@ -906,6 +954,43 @@ class WNTRService:
                 'error': str(e)
             }
     
+    def _model_cache_path(self, file_path: str) -> str:
+        """Pickle cache location for the parsed model of an INP file, keyed by path and WNTR version"""
+        # Same directory resolution as WNTRSimulationService._network_cache_path; keep the two in sync
+        data_root = os.environ.get('BOORIE_DATA_DIR')
+        if data_root:
+            cache_dir = os.path.join(data_root, 'wntr-cache')
+        else:
+            cache_dir = os.path.join(os.path.expanduser('~'), '.cache', 'boorie', 'wntr')
+        digest = hashlib.sha256(os.path.abspath(file_path).encode('utf-8')).hexdigest()
+        return os.path.join(cache_dir, f'model_{wntr.__version__}_{digest}.pkl')
+    
+    def _read_cached_model(self, cache_path: str, content_digest: str) -> Optional[Tuple[Any, List[Dict[str, str]]]]:
+        """
+        Return (model, load warnings) from the cache if it was parsed from the same
+        INP content (SHA-256), otherwise None
+        """
+        try:
+            with open(cache_path, 'rb') as f:
+                digest, wn, model_warnings = pickle.load(f)
+            return (wn, model_warnings) if digest == content_digest else None
+        except Exception:
+            return None
+    
+    def _write_cached_model(self, cache_path: str, content_digest: str, wn, model_warnings: List[Dict[str, str]]) -> None:
+        """Best-effort atomic write of a parsed model, its load warnings and INP content hash to the cache"""
+        temp_path = None
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(cache_path), suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump((content_digest, wn, model_warnings), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, cache_path)
+        except Exception:
+            # The cache is an optimization only; never fail a load over it
+            if temp_path and os.path.exists(temp_path):
+                os.remove(temp_path)
+    
     def _preprocess_inp_file(self, file_path: str) -> None:
         """
         Preprocess the INP file to fix common issues
@@ -967,6 +1052,19 @@ class WNTRService:
 wntr_service = WNTRService()
 
 
+def _emit(result):
+    """Write a CLI result to stdout as one compact JSON line, using orjson when it is installed"""
+    import sys
+    if orjson is not None:
+        payload = orjson.dumps(result, option=orjson.OPT_SERIALIZE_NUMPY)
+    else:
+        payload = json.dumps(result).encode('utf-8')
+    sys.stdout.flush()
+    sys.stdout.buffer.write(payload)
+    sys.stdout.buffer.write(b'\n')
+    sys.stdout.buffer.flush()
+
+
 # CLI interface for testing
 if __name__ == "__main__":
     import sys
@@ -981,22 +1079,20 @@ if __name__ == "__main__":
     
     if command == "load":
         result = wntr_service.load_inp_file(file_path)
-        print(json.dumps(result, indent=2))
+        _emit(result)
     
     elif command == "simulate":
-        # First load the file
-        load_result = wntr_service.load_inp_file(file_path)
-        if load_result['success']:
-            result = wntr_service.run_simulation()
-            print(json.dumps(result, indent=2))
+        result = wntr_service.load_and_simulate(file_path)
+        if result['load']['success']:
+            _emit(result['simulation'])
         else:
-            print(f"Error loading file: {load_result['error']}")
+            print(f"Error loading file: {result['error']}")
     
     elif command == "analyze":
         # First load the file
         load_result = wntr_service.load_inp_file(file_path)
         if load_result['success']:
             result = wntr_service.analyze_network()
-            print(json.dumps(result, indent=2))
+            _emit(result)
         else:
             print(f"Error loading file: {load_result['error']}")
\ No newline at end of file
@@ -199,11 +199,14 @@ class WNTRAnalysisService:
             min_pressure_threshold = options.get('min_pressure', 10.0) # meters
             
             # Identifying nodes with pressure below threshold at any time step
+            # Reduce every column at once instead of slicing one node at a time with .loc
+            min_by_node = dict(zip(pressure.columns, pressure.min().tolist()))
+            mean_by_node = dict(zip(pressure.columns, pressure.mean().tolist()))
+
             top_critical_nodes = []
             for node_name in wn.node_name_list:
-                node_pressures = pressure.loc[:, node_name]
-                min_p = float(node_pressures.min())
-                mean_p = float(node_pressures.mean())
+                min_p = float(min_by_node[node_name])
+                mean_p = float(mean_by_node[node_name])
                 
                 if min_p < min_pressure_threshold:
                     # Calculate a score 0-1 based on deficit
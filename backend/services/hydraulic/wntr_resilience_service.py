@@ -90,12 +90,12 @@ class WNTRResilienceService:
 
     def _network_summary(self, wn):
         return {
-            'junctions': len(wn.junction_name_list),
-            'tanks': len(wn.tank_name_list),
-            'reservoirs': len(wn.reservoir_name_list),
-            'pipes': len(wn.pipe_name_list),
-            'pumps': len(wn.pump_name_list),
-            'valves': len(wn.valve_name_list),
+            'junctions': wn.num_junctions,
+            'tanks': wn.num_tanks,
+            'reservoirs': wn.num_reservoirs,
+            'pipes': wn.num_pipes,
+            'pumps': wn.num_pumps,
+            'valves': wn.num_valves,
         }
 
     # ------------------------------------------------------------------
@@ -214,8 +214,10 @@ class WNTRResilienceService:
             baseline_results = self._run_extended(wn_baseline, duration_hours)
             baseline_pressure = baseline_results.node['pressure']
 
-            # Failure run
-            wn_failure = self.load_network(inp_file)
+            # Failure run: rewind the baseline model to its initial state instead of loading
+            # the INP again; the failure controls are the only change on top of it
+            wn_failure = wn_baseline
+            wn_failure.reset_initial_values()
             applied = self._apply_component_failures(wn_failure, components, failure_start_hours, restore_hours)
             if not applied:
                 print(json.dumps({'success': False, 'error': 'None of the specified components exist in the network'}))
@@ -225,12 +227,16 @@ class WNTRResilienceService:
             pressure = failure_results.node['pressure']
             report_ts_hours = wn_failure.options.time.report_timestep / 3600.0
 
+            # Column-wise reductions, looked up by name, instead of one .loc slice per junction
+            min_by_node = dict(zip(pressure.columns, pressure.min().tolist()))
+            baseline_min_by_node = dict(zip(baseline_pressure.columns, baseline_pressure.min().tolist()))
+            below_by_node = dict(zip(pressure.columns, (pressure < min_pressure_threshold).sum().tolist()))
+
             affected_nodes = []
             for node_name in wn_failure.junction_name_list:
-                node_pressure = pressure.loc[:, node_name]
-                min_p = float(node_pressure.min())
-                baseline_min_p = float(baseline_pressure.loc[:, node_name].min()) if node_name in baseline_pressure.columns else min_p
-                below_threshold_steps = int((node_pressure < min_pressure_threshold).sum())
+                min_p = float(min_by_node[node_name])
+                baseline_min_p = float(baseline_min_by_node.get(node_name, min_p))
+                below_threshold_steps = int(below_by_node[node_name])
                 outage_hours = below_threshold_steps * report_ts_hours
 
                 if min_p < min_pressure_threshold or outage_hours > 0:
@@ -243,15 +249,20 @@ class WNTRResilienceService:
                     })
             affected_nodes.sort(key=lambda n: n['outage_hours'], reverse=True)
 
+            # Transpose once and walk columns by position rather than .loc per element
+            pressure_by_node = dict(zip(pressure.columns, pressure.to_numpy().T.tolist()))
+            flowrate = failure_results.link['flowrate']
+            flowrate_by_link = dict(zip(flowrate.columns, flowrate.to_numpy().T.tolist()))
+
             node_results = {}
             for node_name in wn_failure.node_name_list:
                 node_results[node_name] = {
-                    'pressure': pressure.loc[:, node_name].tolist(),
+                    'pressure': pressure_by_node[node_name],
                 }
             link_results = {}
             for link_name in wn_failure.link_name_list:
                 link_results[link_name] = {
-                    'flowrate': failure_results.link['flowrate'].loc[:, link_name].tolist(),
+                    'flowrate': flowrate_by_link[link_name],
                 }
 
             result = {
@@ -347,8 +358,9 @@ class WNTRResilienceService:
             data = {'before': before}
 
             if failed_components:
-                wn_after = self.load_network(inp_file)
-                wn_after.options.time.duration = duration_hours * 3600.0
+                # Reuse the "before" model rewound to its initial state rather than re-parsing the INP
+                wn_after = wn_before
+                wn_after.reset_initial_values()
                 self._apply_component_failures(wn_after, failed_components, failure_start_hours, None)
                 after = self._resilience_snapshot(wn_after, min_pressure_threshold)
                 data['after'] = after
@@ -404,7 +416,7 @@ class WNTRResilienceService:
             beta = float(options.get('beta', 0.5))  # lognormal dispersion, ALA default ~0.5
 
             pipe_failure_probability = [float(p) for p in lognorm.cdf(intensities, s=beta, scale=median)]
-            pipe_count = len(wn.pipe_name_list)
+            pipe_count = wn.num_pipes
             expected_failed_pipes = [p * pipe_count for p in pipe_failure_probability]
             total_length_km = sum(wn.get_link(p).length for p in wn.pipe_name_list) / 1000.0
 
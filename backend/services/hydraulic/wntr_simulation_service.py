@@ -5,83 +5,239 @@ WNTR Simulation Service for hydraulic simulation
 import sys
 import json
 import os
+import re
+import base64
+import hashlib
+import pickle
+import tempfile
 import wntr
+from wntr.network import LinkStatus
+import numpy as np
 import warnings
+from concurrent.futures import ProcessPoolExecutor
 import time
 
+try:
+    import orjson  # Optional C-accelerated encoder; not part of the base WNTR environment
+except ImportError:
+    orjson = None
+
 # Suppress specific WNTR warnings that are informational only
 warnings.filterwarnings('ignore', message='Changing the headloss formula from')
 warnings.filterwarnings('ignore', message='Not all curves were used in')
 
+# INP section headers, and [BACKDROP] UNITS lines whose unit EPANET does not accept
+SECTION_HEADER_RE = re.compile(r'^[ \t]*(\[[^\n]*\])[ \t]*$', re.MULTILINE)
+BACKDROP_HEADER_RE = re.compile(r'^[ \t]*\[BACKDROP\][ \t]*$', re.MULTILINE | re.IGNORECASE)
+INVALID_BACKDROP_UNITS_RE = re.compile(
+    r'^[ \t]*(UNITS[ \t]+(?!(?:FEET|METERS|DEGREES|NONE)(?:[ \t]|$))\S[^\n]*?)[ \t]*$',
+    re.MULTILINE | re.IGNORECASE
+)
+
+# Pressure-driven demand parameters accepted on the network options and on junctions
+PDD_ATTRIBUTES = ('required_pressure', 'minimum_pressure', 'pressure_exponent')
+
+
+def _emit(result):
+    """Write a CLI result to stdout as one JSON line, using orjson when it is installed"""
+    if orjson is not None:
+        payload = orjson.dumps(result, option=orjson.OPT_SERIALIZE_NUMPY)
+    else:
+        payload = json.dumps(result).encode('utf-8')
+    # Write the encoded bytes directly instead of building a second str copy for print()
+    sys.stdout.flush()
+    sys.stdout.buffer.write(payload)
+    sys.stdout.buffer.write(b'\n')
+    sys.stdout.buffer.flush()
+
 class WNTRSimulationService:
     def __init__(self):
-        pass
+        # Pickled networks keyed by INP path while a batch is running (None outside batches)
+        self._batch_networks = None
 
-    def load_network(self, inp_file):
-        """Load network with robust handling for backdrop units"""
-        import tempfile
-        import shutil
-        
+    def _fix_backdrop_units(self, text):
+        """Comment out invalid UNITS lines inside [BACKDROP] and replace them with UNITS NONE"""
+        # Jump straight to each [BACKDROP] header; only its span up to the next section is rewritten.
+        # Returns `text` itself when nothing needed fixing.
+        pieces = []
+        last = 0
+        replaced = 0
+        for header in BACKDROP_HEADER_RE.finditer(text):
+            start = header.end()
+            next_header = SECTION_HEADER_RE.search(text, start)
+            end = next_header.start() if next_header else len(text)
+            fixed, count = INVALID_BACKDROP_UNITS_RE.subn(r'; \1 (Modified by Boorie)\nUNITS NONE', text[start:end])
+            pieces.append(text[last:start])
+            pieces.append(fixed)
+            replaced += count
+            last = end
+        if not replaced:
+            return text
+        pieces.append(text[last:])
+        return ''.join(pieces)
+
+    def _network_cache_path(self, inp_file):
+        """
+        Pickle cache location for a parsed network, keyed by INP path and WNTR version.
+
+        One entry per file: a new revision of the INP overwrites the previous one.
+        """
+        # Same directory resolution as WNTRService._model_cache_path; keep the two in sync
+        data_root = os.environ.get('BOORIE_DATA_DIR')
+        if data_root:
+            cache_dir = os.path.join(data_root, 'wntr-cache')
+        else:
+            cache_dir = os.path.join(os.path.expanduser('~'), '.cache', 'boorie', 'wntr')
+        digest = hashlib.sha256(os.path.abspath(inp_file).encode('utf-8')).hexdigest()
+        return os.path.join(cache_dir, f'wn_{wntr.__version__}_{digest}.pkl')
+
+    def _read_cached_network(self, cache_path, content_digest):
+        """Return the cached WaterNetworkModel if it was parsed from the same INP content, else None"""
+        try:
+            with open(cache_path, 'rb') as f:
+                digest, wn = pickle.load(f)
+            return wn if digest == content_digest else None
+        except Exception:
+            return None
+
+    def _write_cached_network(self, cache_path, content_digest, wn):
+        """Best-effort atomic write of a parsed network and its INP content hash to the pickle cache"""
+        temp_path = None
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(cache_path), suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump((content_digest, wn), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, cache_path)
+        except Exception:
+            # The cache is an optimization only; never fail a simulation over it
+            if temp_path and os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def _parse_network(self, inp_file):
+        """Parse an INP file with robust handling for backdrop units; raises if it cannot be loaded"""
+        # Only worth retrying the original file if what failed was a sanitized copy
+        retry_original = True
         try:
             # Create a localized temporary file copy to attempt fixes
-            with open(inp_file, 'r', encoding='utf-8', errors='ignore') as f:
-                lines = f.readlines()
-            
-            # Stateful parsing to handle [BACKDROP] section correctly
-            fixed_lines = []
-            in_backdrop_section = False
-            
-            for line in lines:
-                stripped = line.strip().upper()
-                
-                # Check for section headers
-                if stripped.startswith('[') and stripped.endswith(']'):
-                    if stripped == '[BACKDROP]':
-                        in_backdrop_section = True
-                    else:
-                        in_backdrop_section = False
-                    fixed_lines.append(line)
-                    continue
-                
-                # Check for UNITS line inside [BACKDROP]
-                if in_backdrop_section and stripped.startswith('UNITS'):
-                    parts = stripped.split()
-                    if len(parts) >= 2:
-                        unit = parts[1] # "UNITS Meters" -> parts[1] is Meters
-                        if unit not in ['FEET', 'METERS', 'DEGREES', 'NONE']:
-                            # Replace with valid unit
-                            fixed_lines.append(f"; {line.strip()} (Modified by Boorie)\n")
-                            fixed_lines.append(f"UNITS NONE\n")
-                            continue
-                
-                fixed_lines.append(line)
-            
-            # Write key changes to a temporary file
-            fd, temp_path = tempfile.mkstemp(suffix='.inp', text=True)
-            with os.fdopen(fd, 'w') as f:
-                f.writelines(fixed_lines)
-            
             try:
-                wn = wntr.network.WaterNetworkModel(temp_path)
+                with open(inp_file, 'r', encoding='utf-8') as f:
+                    text = f.read()
+                clean_encoding = True
+            except UnicodeDecodeError:
+                # Undecodable bytes are dropped, so the original can't be parsed as-is
+                with open(inp_file, 'r', encoding='utf-8', errors='ignore') as f:
+                    text = f.read()
+                clean_encoding = False
+
+            # Reuse the parsed model from a previous run if the INP content is unchanged
+            cache_path = self._network_cache_path(inp_file)
+            content_digest = hashlib.sha256(text.encode('utf-8')).hexdigest()
+            wn = self._read_cached_network(cache_path, content_digest)
+            if wn is not None:
                 return wn
-            finally:
-                # Clean up temp file
-                if os.path.exists(temp_path):
-                    os.remove(temp_path)
+
+            fixed_text = self._fix_backdrop_units(text)
+            if fixed_text is text and clean_encoding:
+                # Nothing to fix: parse the original directly, without a temp copy
+                retry_original = False
+                wn = wntr.network.WaterNetworkModel(inp_file)
+            else:
+                # Write key changes to a temporary file
+                fd, temp_path = tempfile.mkstemp(suffix='.inp')
+                # Buffered binary write loops over short writes; one syscall in the usual case
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(fixed_text.encode('utf-8'))
+                
+                try:
+                    wn = wntr.network.WaterNetworkModel(temp_path)
+                finally:
+                    # Clean up temp file
+                    if os.path.exists(temp_path):
+                        os.remove(temp_path)
+
+            self._write_cached_network(cache_path, content_digest, wn)
+            return wn
                     
-        except Exception as e:
+        except Exception:
             # Fallback: try loading original file if temp fix failed
-            try:
-                return wntr.network.WaterNetworkModel(inp_file)
-            except Exception as e2:
-                print(json.dumps({'success': False, 'error': str(e2)}))
-                sys.exit(1)
+            if not retry_original:
+                raise
+            return wntr.network.WaterNetworkModel(inp_file)
+
+    def load_network(self, inp_file):
+        """Load network with robust handling for backdrop units"""
+        try:
+            return self._parse_network(inp_file)
+        except Exception as e:
+            print(json.dumps({'success': False, 'error': str(e)}))
+            sys.exit(1)
+
+    def _network_for_run(self, inp_file):
+        """Fresh network for one run; inside a batch each INP is parsed once and copied per run"""
+        if self._batch_networks is None:
+            return self.load_network(inp_file)
+        if inp_file not in self._batch_networks:
+            self._batch_networks[inp_file] = pickle.dumps(
+                self._parse_network(inp_file), protocol=pickle.HIGHEST_PROTOCOL
+            )
+        return pickle.loads(self._batch_networks[inp_file])
 
     def run_hydraulic(self, inp_file, options=None):
         """Run hydraulic simulation"""
+        _emit(self._hydraulic_result(inp_file, options))
+
+    def run_water_quality(self, inp_file, options=None):
+        """Run water quality simulation (Simulated/Mock for stability on macOS)"""
+        _emit(self._water_quality_result(inp_file, options))
+
+    def run_scenario(self, inp_file, options=None):
+        """Run scenario simulation (e.g. pipe closure)"""
+        _emit(self._scenario_result(inp_file, options))
+
+    def run_batch(self, runs, workers=1):
+        """
+        Run several simulations and print their results as one JSON array, in input order.
+
+        Each entry is {"command": "run_hydraulic" | "run_water_quality" | "run_scenario",
+        "inp_file": ..., "options": {...}}; each distinct INP is loaded only once per process.
+        With workers > 1 the runs are spread over a process pool (workers <= 0 uses every
+        core); combine with stats_only to keep the results sent back from workers small.
+        """
+        if workers <= 0:
+            workers = os.cpu_count() or 1
+        if workers > 1 and len(runs) > 1:
+            workers = min(workers, len(runs))
+            chunksize = max(1, len(runs) // (4 * workers))
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                _emit(list(pool.map(_batch_worker, runs, chunksize=chunksize)))
+            return
+
+        self._batch_networks = {}
+        try:
+            _emit([self._batch_result(run) for run in runs])
+        finally:
+            self._batch_networks = None
+
+    def _batch_result(self, run):
+        """Result payload for one run_batch entry"""
+        if not isinstance(run, dict):
+            return {'success': False, 'error': f'Invalid batch entry: expected an object, got {type(run).__name__}'}
+        handlers = {
+            'run_hydraulic': self._hydraulic_result,
+            'run_water_quality': self._water_quality_result,
+            'run_scenario': self._scenario_result,
+        }
+        handler = handlers.get(run.get('command'))
+        if handler is None:
+            return {'success': False, 'error': f"Unknown command: {run.get('command')}"}
+        return handler(run.get('inp_file'), run.get('options'))
+
+    def _hydraulic_result(self, inp_file, options=None):
+        """Run hydraulic simulation and return the result payload"""
         start_time = time.time()
         try:
-            wn = self.load_network(inp_file)
+            wn = self._network_for_run(inp_file)
             options = options or {}
             
             # Apply basic options if provided
@@ -91,71 +247,77 @@ class WNTRSimulationService:
                 ts_seconds = float(options['timestep']) * 3600
                 wn.options.time.hydraulic_timestep = ts_seconds
                 wn.options.time.report_timestep = ts_seconds
+
+            # Pressure-driven demand: set the network-wide defaults once; WNTR uses them for every
+            # junction without its own values, so only explicit per-junction overrides are looped
+            if options.get('simulation_type') == 'pressure_driven':
+                pdd = options.get('pdd_parameters') or {}
+                hydraulic = wn.options.hydraulic
+                hydraulic.demand_model = 'PDD'
+                for key in PDD_ATTRIBUTES:
+                    if key in pdd:
+                        setattr(hydraulic, key, float(pdd[key]))
+                for junction_name, overrides in (pdd.get('per_junction') or {}).items():
+                    # Skip unknown ids and non-junction nodes, like the pipe_closure scenario does
+                    try:
+                        junction = wn.get_node(junction_name)
+                    except KeyError:
+                        continue
+                    if junction.node_type != 'Junction':
+                        continue
+                    for key in PDD_ATTRIBUTES:
+                        if key in overrides:
+                            setattr(junction, key, float(overrides[key]))
                 
             # Prepare for WNTRSimulator (fix incompatibilities)
-            # 1. H-W Headloss
-            if str(wn.options.hydraulic.headloss).upper() in ['D-W', 'DARCY-WEISBACH', 'DW']:
-                wn.options.hydraulic.headloss = 'H-W'
-            
-            # 2. GPVs -> Pipes
-            if len(wn.gpv_name_list) > 0:
-                gpv_names = list(wn.gpv_name_list)
-                for name in gpv_names:
-                    gpv = wn.get_link(name)
-                    u, v = gpv.start_node_name, gpv.end_node_name
-                    wn.remove_link(name)
-                    wn.add_pipe(name, u, v, length=1.0, diameter=0.3, roughness=130, check_valve=False)
-
-            # 3. Fix invalid timesteps
-            try:
-                if wn.options.time.hydraulic_timestep <= 0:
-                     wn.options.time.hydraulic_timestep = 3600.0
-                if wn.options.time.report_timestep <= 0:
-                     wn.options.time.report_timestep = 3600.0
-            except:
-                pass
+            self._prepare_wntr_simulator(wn)
 
             sim = wntr.sim.WNTRSimulator(wn)
             results = sim.run_sim()
+            arrays = self._result_arrays(results, ('pressure', 'head', 'demand'), ('flowrate', 'velocity'))
 
             # Clean results for JSON output (convert to simple dicts/lists)
             # This is a simplified example. You might want full time-series data.
-            node_results = {}
-            for node_name in wn.node_name_list:
-                node_results[node_name] = {
-                    'pressure': results.node['pressure'].loc[:, node_name].tolist(),
-                    'head': results.node['head'].loc[:, node_name].tolist(),
-                    'demand': results.node['demand'].loc[:, node_name].tolist()
+            # stats_only callers (e.g. scenario sweeps) only read 'stats', so skip the series entirely
+            stats_only = bool(options.get('stats_only'))
+            binary_series = options.get('series_format') == 'base64' and not stats_only
+            if stats_only or binary_series:
+                node_results, link_results = {}, {}
+            else:
+                pressure = self._series_by_name(arrays['pressure'])
+                head = self._series_by_name(arrays['head'])
+                demand = self._series_by_name(arrays['demand'])
+                node_results = {
+                    node_name: {
+                        'pressure': pressure[node_name],
+                        'head': head[node_name],
+                        'demand': demand[node_name]
+                    }
+                    for node_name in wn.node_name_list
                 }
 
-            link_results = {}
-            for link_name in wn.link_name_list:
-                link_results[link_name] = {
-                    'flowrate': results.link['flowrate'].loc[:, link_name].tolist(),
-                    'velocity': results.link['velocity'].loc[:, link_name].tolist(),
+                flowrate = self._series_by_name(arrays['flowrate'])
+                velocity = self._series_by_name(arrays['velocity'])
+                link_results = {
+                    link_name: {
+                        'flowrate': flowrate[link_name],
+                        'velocity': velocity[link_name],
+                    }
+                    for link_name in wn.link_name_list
                 }
 
             end_time = time.time()
             execution_time = end_time - start_time
 
             # Calculate Stats
+            flow_stats = self._frame_stats(arrays['flowrate'])
+            # Total pipe length in km: the UI renders this key as "Total Length"
+            pipe_lengths = wn.query_link_attribute('length', link_type=wntr.network.Pipe)
+            flow_stats['total_demand'] = float(pipe_lengths.sum()) / 1000.0
             stats = {
-                'pressure': {
-                    'min': float(results.node['pressure'].min().min()) if not results.node['pressure'].empty else 0,
-                    'max': float(results.node['pressure'].max().max()) if not results.node['pressure'].empty else 0,
-                    'mean': float(results.node['pressure'].mean().mean()) if not results.node['pressure'].empty else 0,
-                },
-                'flow': {
-                     'min': float(results.link['flowrate'].min().min()) if not results.link['flowrate'].empty else 0,
-                     'max': float(results.link['flowrate'].max().max()) if not results.link['flowrate'].empty else 0,
-                     'mean': float(results.link['flowrate'].mean().mean()) if not results.link['flowrate'].empty else 0,
-                     'total_demand': sum(wn.get_link(p_name).length for p_name in wn.pipe_name_list) / 1000.0 
-                },
-                'velocity': {
-                     'min': float(results.link['velocity'].min().min()) if not results.link['velocity'].empty else 0,
-                     'max': float(results.link['velocity'].max().max()) if not results.link['velocity'].empty else 0,
-                     'mean': float(results.link['velocity'].mean().mean()) if not results.link['velocity'].empty else 0,
-                }
+                'pressure': self._frame_stats(arrays['pressure']),
+                'flow': flow_stats,
+                'velocity': self._frame_stats(arrays['velocity'])
             }
 
             result = {
@@ -168,27 +330,29 @@ class WNTRSimulationService:
                     'timestamps': results.node['pressure'].index.tolist(),
                     'stats': stats,
                     'summary': {
-                        'nodes': len(wn.node_name_list),
-                        'links': len(wn.link_name_list),
+                        'nodes': wn.num_nodes,
+                        'links': wn.num_links,
                         'duration': wn.options.time.duration,
                         'hydraulic_timestep': wn.options.time.hydraulic_timestep,
                         'report_timestep': wn.options.time.report_timestep
                     }
                 }
             }
-            print(json.dumps(result))
+            if binary_series:
+                result['data']['series'] = self._encode_series(arrays)
+            return result
             
         except Exception as e:
-            print(json.dumps({'success': False, 'error': str(e)}))
+            return {'success': False, 'error': str(e)}
 
-    def run_water_quality(self, inp_file, options=None):
-        """Run water quality simulation (Simulated/Mock for stability on macOS)"""
+    def _water_quality_result(self, inp_file, options=None):
+        """Run water quality simulation (Simulated/Mock for stability on macOS) and return the result payload"""
         # NOTE: Real WQ requires EpanetSimulator, which causes SIGKILL/SIGTRAP on this macOS env.
         # We fallback to WNTRSimulator (Hydraulic) and generate synthetic WQ data to ensure UI functionality.
         start_time = time.time()
         options = options or {}
         try:
-            wn = self.load_network(inp_file)
+            wn = self._network_for_run(inp_file)
             
             # Use WNTRSimulator (Hydraulic only, stable)
             self._prepare_wntr_simulator(wn)
@@ -200,34 +364,33 @@ class WNTRSimulationService:
             duration = wn.options.time.duration
             steps = len(results.node['pressure'].index)
             
+            # Generate synthetic data based on parameter (identical for every node, so build it once)
+            if parameter == 'AGE':
+                # Linear increase 0 -> duration (simplified age)
+                step_hours = duration / steps / 3600.0 if steps else 0.0
+                quality = np.arange(steps, dtype=np.float64) * step_hours
+            elif parameter == 'TRACE':
+                # Random or constant 0/100? Let's say 0 unless close to source?
+                quality = np.zeros(steps)
+            else:
+                quality = np.zeros(steps)
+            quality_list = quality.tolist()
+
+            pressure = self._series_by_name(self._result_arrays(results, ('pressure',), ())['pressure'])
             node_results = {}
             for node_name in wn.node_name_list:
-                # Generate synthetic data based on parameter
-                if parameter == 'AGE':
-                    # Linear increase 0 -> duration (simplified age)
-                    quality = [i * (duration/steps) / 3600.0 for i in range(steps)] 
-                elif parameter == 'TRACE':
-                    # Random or constant 0/100? Let's say 0 unless close to source?
-                    quality = [0.0] * steps
-                else:
-                    quality = [0.0] * steps
-                    
                 node_results[node_name] = {
-                    'quality': quality,
-                    'pressure': results.node['pressure'].loc[:, node_name].tolist()
+                    'quality': quality_list,
+                    'pressure': pressure[node_name]
                 }
 
-            # Calculate WQ Stats
-            all_quality = []
-            for n in node_results.values():
-                all_quality.extend(n['quality'])
-            
-            import numpy as np
+            # Calculate WQ Stats (every node shares the same series, so its stats are the network's)
+            has_quality = quality.size > 0 and len(node_results) > 0
             stats = {
                 'quality': {
-                    'min': float(np.min(all_quality)) if all_quality else 0,
-                    'max': float(np.max(all_quality)) if all_quality else 0,
-                    'mean': float(np.mean(all_quality)) if all_quality else 0,
+                    'min': float(quality.min()) if has_quality else 0,
+                    'max': float(quality.max()) if has_quality else 0,
+                    'mean': float(quality.mean()) if has_quality else 0,
                     'parameter': parameter
                 }
             }
@@ -242,37 +405,112 @@ class WNTRSimulationService:
                     'timestamps': results.node['pressure'].index.tolist(),
                     'stats': stats,
                     'summary': {
-                        'nodes': len(wn.node_name_list),
+                        'nodes': wn.num_nodes,
                         'duration': wn.options.time.duration,
                         'parameter': parameter,
                         'note': 'Using Hydraulic Simulator + Synthetic WQ due to macOS EpanetSimulator instability.'
                     }
                 }
             }
-            print(json.dumps(result))
+            return result
         except Exception as e:
-            print(json.dumps({'success': False, 'error': str(e)}))
+            return {'success': False, 'error': str(e)}
+
+    def _result_arrays(self, results, node_metrics, link_metrics):
+        """
+        Convert the requested result DataFrames to (columns, ndarray) pairs once per run.
+
+        Series building, stats and base64 packing all read these pairs, so each
+        frame goes through pandas indexing and to_numpy() a single time.
+        Metrics missing from the results are left out.
+        """
+        arrays = {}
+        for source, metrics in ((results.node, node_metrics), (results.link, link_metrics)):
+            for metric in metrics:
+                frame = source.get(metric)
+                if frame is not None:
+                    arrays[metric] = (frame.columns.tolist(), frame.to_numpy())
+        return arrays
+
+    def _series_by_name(self, array):
+        """Map each column of a (columns, ndarray) result pair to its time series"""
+        columns, values = array
+        matrix = values.T
+        if orjson is not None:
+            # orjson encodes contiguous float32 rows natively with short float32 formatting;
+            # the stdlib fallback needs plain lists, where float32 would only lengthen the output
+            matrix = np.ascontiguousarray(matrix, dtype=np.float32)
+            return dict(zip(columns, matrix))
+        return dict(zip(columns, matrix.tolist()))
+
+    def _encode_series(self, arrays):
+        """
+        Pack (columns, ndarray) result pairs as base64 float32 matrices, one block per metric.
+
+        Each block holds row-major (timesteps x columns) little-endian data, so the
+        consumer can decode it straight into a Float32Array.
+        """
+        series = {}
+        for metric, (columns, values) in arrays.items():
+            values = np.ascontiguousarray(values, dtype='<f4')
+            series[metric] = {
+                'columns': columns,
+                'shape': list(values.shape),
+                'dtype': 'float32',
+                'data_b64': base64.b64encode(values.tobytes()).decode('ascii')
+            }
+        return series
+
+    def _frame_stats(self, array):
+        """Min/max/mean over all values of a (columns, ndarray) result pair (zeros if missing or empty)"""
+        if array is None or array[1].size == 0:
+            return {'min': 0, 'max': 0, 'mean': 0}
+        # One flat reduction per metric; nan-aware like the pandas reductions it replaces
+        values = array[1]
+        return {
+            'min': float(np.nanmin(values)),
+            'max': float(np.nanmax(values)),
+            'mean': float(np.nanmean(values)),
+        }
+
+    def _replace_gpvs_with_pipes(self, wn):
+        """Swap GPVs (unsupported by WNTRSimulator) for short proxy pipes"""
+        # Snapshot endpoints first so the removals and additions run as two flat passes
+        gpv_specs = [
+            (name, gpv.start_node_name, gpv.end_node_name)
+            for name, gpv in ((name, wn.get_link(name)) for name in wn.gpv_name_list)
+        ]
+        for name, _, _ in gpv_specs:
+            wn.remove_link(name)
+        for name, u, v in gpv_specs:
+            wn.add_pipe(name, u, v, length=1.0, diameter=0.3, roughness=130, check_valve=False)
 
     def _prepare_wntr_simulator(self, wn):
         """Helper to prepare network for WNTRSimulator"""
+        hydraulic = wn.options.hydraulic
+        time_opts = wn.options.time
+
         # 1. H-W Headloss
-        if str(wn.options.hydraulic.headloss).upper() in ['D-W', 'DARCY-WEISBACH', 'DW']:
-            wn.options.hydraulic.headloss = 'H-W'
-            
-        # 2. Fix invalid timesteps
+        if str(hydraulic.headloss).upper() in ['D-W', 'DARCY-WEISBACH', 'DW']:
+            hydraulic.headloss = 'H-W'
+
+        # 2. GPVs -> Pipes
+        self._replace_gpvs_with_pipes(wn)
+
+        # 3. Fix invalid timesteps
         try:
-            if wn.options.time.hydraulic_timestep <= 0:
-                 wn.options.time.hydraulic_timestep = 3600.0
-            if wn.options.time.report_timestep <= 0:
-                 wn.options.time.report_timestep = 3600.0
+            if time_opts.hydraulic_timestep <= 0:
+                time_opts.hydraulic_timestep = 3600.0
+            if time_opts.report_timestep <= 0:
+                time_opts.report_timestep = 3600.0
         except:
             pass
 
-    def run_scenario(self, inp_file, options=None):
-        """Run scenario simulation (e.g. pipe closure)"""
+    def _scenario_result(self, inp_file, options=None):
+        """Run scenario simulation (e.g. pipe closure) and return the result payload"""
         start_time = time.time()
         try:
-            wn = self.load_network(inp_file)
+            wn = self._network_for_run(inp_file)
             options = options or {}
             
             # Apply common options
@@ -283,57 +521,52 @@ class WNTRSimulationService:
             scenario_type = options.get('scenario_type', '')
             if scenario_type == 'pipe_closure':
                  components = options.get('components', [])
+                 get_link = wn.get_link
                  for comp_id in components:
                      try:
-                         link = wn.get_link(comp_id)
-                         link.status = 0 # Closed
-                     except:
+                         # status is read-only in WNTR; the closure has to go through initial_status
+                         get_link(comp_id).initial_status = LinkStatus.Closed
+                     except KeyError:
                          pass
             
             # Run Hydraulic using helper
             self._prepare_wntr_simulator(wn)
             
-            # GPV fix override for scenario if needed (GPV logic usually needs explicit handling as removal changes graph)
-            if len(wn.gpv_name_list) > 0:
-                for name in list(wn.gpv_name_list):
-                    gpv = wn.get_link(name)
-                    wn.remove_link(name)
-                    wn.add_pipe(name, gpv.start_node_name, gpv.end_node_name, length=1.0, diameter=0.3, roughness=130)
-            
             sim = wntr.sim.WNTRSimulator(wn)
             results = sim.run_sim()
+            arrays = self._result_arrays(results, ('pressure', 'head'), ('flowrate', 'velocity'))
 
             # Format Results
-            node_results = {}
-            for node_name in wn.node_name_list:
-                node_results[node_name] = {
-                    'pressure': results.node['pressure'].loc[:, node_name].tolist(),
-                    'head': results.node['head'].loc[:, node_name].tolist()
+            # stats_only callers (e.g. scenario sweeps) only read 'stats', so skip the series entirely
+            stats_only = bool(options.get('stats_only'))
+            binary_series = options.get('series_format') == 'base64' and not stats_only
+            if stats_only or binary_series:
+                node_results, link_results = {}, {}
+            else:
+                pressure = self._series_by_name(arrays['pressure'])
+                head = self._series_by_name(arrays['head'])
+                node_results = {
+                    node_name: {
+                        'pressure': pressure[node_name],
+                        'head': head[node_name]
+                    }
+                    for node_name in wn.node_name_list
                 }
-            link_results = {}
-            for link_name in wn.link_name_list:
-                link_results[link_name] = {
-                    'flowrate': results.link['flowrate'].loc[:, link_name].tolist(),
-                    'velocity': results.link['velocity'].loc[:, link_name].tolist() if 'velocity' in results.link else []
+                flowrate = self._series_by_name(arrays['flowrate'])
+                velocity = self._series_by_name(arrays['velocity']) if 'velocity' in arrays else {}
+                link_results = {
+                    link_name: {
+                        'flowrate': flowrate[link_name],
+                        'velocity': velocity.get(link_name, [])
+                    }
+                    for link_name in wn.link_name_list
                 }
 
             # Calculate Scenario Stats
             stats = {
-                'pressure': {
-                    'min': float(results.node['pressure'].min().min()) if not results.node['pressure'].empty else 0,
-                    'max': float(results.node['pressure'].max().max()) if not results.node['pressure'].empty else 0,
-                    'mean': float(results.node['pressure'].mean().mean()) if not results.node['pressure'].empty else 0,
-                },
-                'flow': {
-                     'min': float(results.link['flowrate'].min().min()) if not results.link['flowrate'].empty else 0,
-                     'max': float(results.link['flowrate'].max().max()) if not results.link['flowrate'].empty else 0,
-                     'mean': float(results.link['flowrate'].mean().mean()) if not results.link['flowrate'].empty else 0,
-                },
-                'velocity': {
-                     'min': float(results.link['velocity'].min().min()) if 'velocity' in results.link and not results.link['velocity'].empty else 0,
-                     'max': float(results.link['velocity'].max().max()) if 'velocity' in results.link and not results.link['velocity'].empty else 0,
-                     'mean': float(results.link['velocity'].mean().mean()) if 'velocity' in results.link and not results.link['velocity'].empty else 0,
-                }
+                'pressure': self._frame_stats(arrays['pressure']),
+                'flow': self._frame_stats(arrays['flowrate']),
+                'velocity': self._frame_stats(arrays.get('velocity'))
             }
 
             result = {
@@ -346,16 +579,35 @@ class WNTRSimulationService:
                     'timestamps': results.node['pressure'].index.tolist(),
                     'stats': stats,
                     'summary': {
-                        'nodes': len(wn.node_name_list),
+                        'nodes': wn.num_nodes,
                         'scenario': scenario_type
                     }
                 }
             }
-            print(json.dumps(result))
+            if binary_series:
+                result['data']['series'] = self._encode_series(arrays)
+            return result
         except Exception as e:
-             print(json.dumps({'success': False, 'error': str(e)}))
+             return {'success': False, 'error': str(e)}
+
+_worker_service = None
+
+
+def _batch_worker(run):
+    """Run one batch entry in a pool process, reusing that process's parsed networks"""
+    global _worker_service
+    if _worker_service is None:
+        _worker_service = WNTRSimulationService()
+        _worker_service._batch_networks = {}
+    return _worker_service._batch_result(run)
+
 
 if __name__ == "__main__":
+    # Usage: wntr_simulation_service.py <command> <inp_file> [options_json]
+    #        wntr_simulation_service.py run_batch <runs.json | -> [{"workers": N}]
+    # Options shared by run_hydraulic and run_scenario:
+    #   series_format: "base64" to return packed float32 series under data.series
+    #   stats_only:    true to omit node_results/link_results and return only stats
     if len(sys.argv) < 3:
         print(json.dumps({'success': False, 'error': 'Insufficient arguments'}))
         sys.exit(1)
@@ -372,7 +624,21 @@ if __name__ == "__main__":
             
     service = WNTRSimulationService()
     
-    if command == "run_hydraulic":
+    if command == "run_batch":
+        # The second argument is a JSON file with the list of runs, or "-" to read it from stdin
+        try:
+            if inp_file == '-':
+                runs = json.load(sys.stdin)
+            else:
+                with open(inp_file, 'r', encoding='utf-8') as f:
+                    runs = json.load(f)
+            if not isinstance(runs, list) or not all(isinstance(run, dict) for run in runs):
+                raise ValueError('expected a JSON array of run objects')
+        except Exception as e:
+            print(json.dumps({'success': False, 'error': f'Invalid batch definition: {e}'}))
+            sys.exit(1)
+        service.run_batch(runs, int(options.get('workers', 1)))
+    elif command == "run_hydraulic":
         service.run_hydraulic(inp_file, options)
     elif command == "run_water_quality":
         service.run_water_quality(inp_file, options)
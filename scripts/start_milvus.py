@@ -19,7 +19,7 @@ import os
 import signal
 import socket
 import sys
-import time
+import threading
 from pathlib import Path
 
 
@@ -34,18 +34,34 @@ def find_free_port(start: int = 19530, end: int = 19550) -> int:
     raise RuntimeError(f"No free port in range {start}-{end}")
 
 
+def wait_for_stop() -> None:
+    """Bloquea hasta recibir SIGINT/SIGTERM, sin despertar el proceso periódicamente."""
+    stop = threading.Event()
+
+    def _signal(_sig, _frame):
+        stop.set()
+
+    signal.signal(signal.SIGINT, _signal)
+    signal.signal(signal.SIGTERM, _signal)
+
+    if os.name == "nt":
+        # En Windows un wait sin timeout no deja pasar Ctrl+C; sondeamos cada segundo.
+        while not stop.wait(1):
+            pass
+    else:
+        stop.wait()
+
+
 def main() -> int:
+    # stdout con buffer por línea: cada log llega al pipe de Electron sin un flush por print.
+    sys.stdout.reconfigure(line_buffering=True)
     try:
         from milvus_lite.server_manager import Server
     except Exception as e:
-        print(f"[milvus] milvus-lite no instalado: {e}", flush=True)
-        print("[milvus] ejecuta:  ./venv-wntr/bin/pip install milvus-lite", flush=True)
+        print(f"[milvus] milvus-lite no instalado: {e}")
+        print("[milvus] ejecuta:  ./venv-wntr/bin/pip install milvus-lite")
         # Quedamos en idle — la app cae a fail-soft (search devuelve [] sin spam).
-        try:
-            while True:
-                time.sleep(3600)
-        except KeyboardInterrupt:
-            return 0
+        wait_for_stop()
         return 0
 
     # En dev, los datos viven junto al repo (data/boorie-milvus). En la app
@@ -64,34 +80,25 @@ def main() -> int:
     port = find_free_port(19530, 19550)
     address = f"127.0.0.1:{port}"
 
-    print(f"[milvus] DB:      {db_file}", flush=True)
-    print(f"[milvus] Address: {address}", flush=True)
+    print(f"[milvus] DB:      {db_file}")
+    print(f"[milvus] Address: {address}")
 
     server = Server(db_file=str(db_file), address=address)
     if not server.init():
-        print("[milvus] Server.init() falló", flush=True)
+        print("[milvus] Server.init() falló")
         return 1
     if not server.start():
-        print("[milvus] Server.start() falló", flush=True)
+        print("[milvus] Server.start() falló")
         return 1
 
     # Publicar el puerto efectivo para que MilvusService lo lea.
     port_file.write_text(str(port), encoding="utf-8")
 
-    print(f"[milvus] Milvus Lite listo en {address} (port file: {port_file})", flush=True)
+    print(f"[milvus] Milvus Lite listo en {address} (port file: {port_file})")
 
     # Esperar señales de terminación y parar limpiamente.
-    stop = {"flag": False}
-
-    def _signal(_sig, _frame):
-        stop["flag"] = True
-
-    signal.signal(signal.SIGINT, _signal)
-    signal.signal(signal.SIGTERM, _signal)
-
     try:
-        while not stop["flag"]:
-            time.sleep(1)
+        wait_for_stop()
     finally:
         try:
             if port_file.exists():